@@ -1,2 +1,9 @@
 DEVICE_NAME = "Trunex VoIP Tester"
 VERSION = "0.0.1"
+
+# Button on GPIO17, wired active-low to ground
+BUTTON_GPIO_CHIP = "gpiochip0"
+BUTTON_GPIO_LINE = 17
+BUTTON_DEBOUNCE_MS = 20
+BUTTON_DOUBLE_CLICK_MS = 300
+BUTTON_LONG_PRESS_MS = 800
@@ -1,4 +1,7 @@
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 logging.basicConfig(
     level=logging.INFO,
@@ -6,3 +9,46 @@ logging.basicConfig(
 )
 
 logger = logging.getLogger("voiptester")
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def start_log_listener():
+    """
+    Put the root handlers behind a queue drained by a background thread, so
+    logging calls on the button path only enqueue the record.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_log_listener():
+    """
+    Flush queued records, stop the background logging thread and hand the
+    original handlers back to the root logger.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+
+    _listener = None
+    _queue_handler = None
@@ -1,14 +1,123 @@
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
 # Add keystore, saved settings, etc. later
 
+STORAGE_PATH = "/tmp/voiptester_storage.txt"
+FLUSH_INTERVAL_S = 5.0
+
+
+class _AppendLog:
+    """
+    Append-only record file kept mapped in memory.
+
+    Records are copied straight into the shared mapping, so they reach the page
+    cache without a syscall and survive a process crash. The mapping is synced
+    to disk FLUSH_INTERVAL_S after the first unsynced write. The file is grown
+    in whole pages and zero padded after the last record.
+    """
+
+    def __init__(self, path: str):
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size == 0:
+            size = mmap.PAGESIZE
+            os.ftruncate(self._fd, size)
+
+        self._map = mmap.mmap(self._fd, size)
+        end = self._map.find(b"\0")
+        self._off = size if end == -1 else end
+
+        self._lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+
+    def append(self, record: bytes):
+        with self._lock:
+            end = self._off + len(record)
+            if end > len(self._map):
+                # resize() extends the file and remaps it in one call
+                pages = -(-max(end, 2 * len(self._map)) // mmap.PAGESIZE)
+                self._map.resize(pages * mmap.PAGESIZE)
+
+            self._map[self._off : end] = record
+            self._off = end
+
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_INTERVAL_S, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush_timer = None
+            self._map.flush()
+
+
+_log: Optional[_AppendLog] = None
+
 
 def save_value(key: str, value: str):
-    with open("/tmp/voiptester_storage.txt", "a") as f:
-        f.write(f"{key}={value}\n")
+    global _log
+    if _log is None:
+        _log = _AppendLog(STORAGE_PATH)
+    _log.append(f"{key}={value}\n".encode())
 
 
-def load_all():
+@contextmanager
+def _mapped_records() -> Iterator[Optional[mmap.mmap]]:
+    """
+    Map the storage file read-only, yielding None if it is missing or empty.
+    """
     try:
-        with open("/tmp/voiptester_storage.txt") as f:
-            return [line.strip() for line in f.readlines()]
+        fd = os.open(STORAGE_PATH, os.O_RDONLY)
     except FileNotFoundError:
-        return []
+        yield None
+        return
+
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            yield None
+            return
+
+        with mmap.mmap(fd, size, prot=mmap.PROT_READ) as mm:
+            yield mm
+    finally:
+        os.close(fd)
+
+
+def _decode_record(line: bytes) -> str:
+    # same cleanup for every reader: strip whitespace, "" marks a blank line
+    return line.decode().strip()
+
+
+def load_all():
+    with _mapped_records() as mm:
+        if mm is None:
+            return []
+
+        # drop the zero padding after the last record
+        end = mm.find(b"\0")
+        records = mm[:end] if end != -1 else mm[:]
+        return [
+            record for record in map(_decode_record, records.split(b"\n")) if record
+        ]
+
+
+def iter_all() -> Iterator[str]:
+    """
+    Yield stored records one at a time, for stores too large to load at once.
+    """
+    with _mapped_records() as mm:
+        if mm is None:
+            return
+
+        for line in iter(mm.readline, b""):
+            if line.startswith(b"\0"):
+                break
+            record = _decode_record(line)
+            if record:
+                yield record
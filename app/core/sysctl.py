@@ -0,0 +1,39 @@
+from app.core.log import logger
+
+# Kernel settings that keep probe latency steady on the tester NIC
+NET_TUNING = {
+    "net.ipv4.tcp_congestion_control": "bbr",
+    # only applies to qdiscs created afterwards; an interface that is already
+    # up keeps its current root qdisc until it is re-created or replaced
+    "net.core.default_qdisc": "fq",
+    "net.ipv4.tcp_mtu_probing": "1",
+    "net.ipv4.tcp_no_metrics_save": "1",
+    "net.core.rmem_max": "134217728",
+    "net.core.wmem_max": "134217728",
+}
+
+
+def write_sysctl(name: str, value: str):
+    """
+    Set a kernel parameter by writing /proc/sys directly, without forking sysctl.
+    :param name: dotted sysctl name, e.g. "net.core.rmem_max"
+    :param value: str
+    """
+    with open("/proc/sys/" + name.replace(".", "/"), "w") as f:
+        f.write(value)
+
+
+def apply_net_tuning() -> bool:
+    """
+    Apply NET_TUNING, logging any setting the kernel rejects.
+    Needs root; bbr also needs the tcp_bbr module.
+    :return: True if every setting was applied
+    """
+    ok = True
+    for name, value in NET_TUNING.items():
+        try:
+            write_sysctl(name, value)
+        except OSError as exc:
+            logger.warning("Could not set %s=%s: %s", name, value, exc)
+            ok = False
+    return ok
@@ -1,3 +1,16 @@
+import select
+import time
+from typing import Optional
+
+from app.core.config import (
+    BUTTON_DEBOUNCE_MS,
+    BUTTON_DOUBLE_CLICK_MS,
+    BUTTON_GPIO_CHIP,
+    BUTTON_GPIO_LINE,
+    BUTTON_LONG_PRESS_MS,
+)
+
+
 class LedButtonIO:
     def __init__(self):
         try:
@@ -10,6 +23,24 @@ class LedButtonIO:
             self.gpio_enabled = False
             print("[GPIO] Disabled (running without hardware)")
 
+        try:
+            import gpiod
+
+            chip = gpiod.Chip(BUTTON_GPIO_CHIP)
+            self._button = chip.get_line(BUTTON_GPIO_LINE)
+            self._button.request(
+                consumer="voiptester",
+                type=gpiod.LINE_REQ_EV_BOTH_EDGES,
+                flags=gpiod.LINE_REQ_FLAG_BIAS_PULL_UP,
+            )
+            # block in the kernel until an edge arrives instead of polling
+            self._epoll = select.epoll()
+            self._epoll.register(self._button.event_get_fd(), select.EPOLLIN)
+            self.button_enabled = True
+        except Exception:
+            self.button_enabled = False
+            print("[Button] Disabled (running without hardware)")
+
     def led_idle(self):
         print("[LED] idle")
 
@@ -23,6 +54,48 @@ class LedButtonIO:
         print("[LED] error")
 
     def read_button_event(self):
-        # Placeholder: always waits for Enter key
-        input("[Button] Press Enter for SINGLE click")
-        return "single"
+        if not self.button_enabled:
+            # Placeholder: always waits for Enter key
+            input("[Button] Press Enter for SINGLE click")
+            return "single"
+
+        pressed_ns = self._wait_for_button(pressed=True)
+        released_ns = self._wait_for_button(pressed=False)
+
+        if released_ns - pressed_ns >= BUTTON_LONG_PRESS_MS * 1_000_000:
+            return "long"
+
+        if self._wait_for_button(True, BUTTON_DOUBLE_CLICK_MS / 1000) is None:
+            return "single"
+
+        self._wait_for_button(pressed=False)
+        return "double"
+
+    def _wait_for_button(
+        self, pressed: bool, timeout: Optional[float] = None
+    ) -> Optional[int]:
+        """
+        Wait until the button settles in the given state.
+        :param pressed: True to wait for a press, False for a release
+        :param timeout: seconds to wait, or None to wait forever
+        :return: kernel timestamp of the edge in ns, or None on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+
+            if not self._epoll.poll(remaining):
+                return None
+
+            event = self._button.event_read()
+            edge_ns = event.sec * 1_000_000_000 + event.nsec
+
+            # swallow contact bounce, then check where the line settled
+            while self._epoll.poll(BUTTON_DEBOUNCE_MS / 1000):
+                self._button.event_read()
+
+            if (self._button.get_value() == 0) == pressed:
+                return edge_ns
@@ -1,3 +1,25 @@
+import math
+
+# Field labels of the result screen, rendered once and pasted as bitmaps
+STATUS_LABELS = (
+    "Status:",
+    "Interface:",
+    "Physical Link Up:",
+    "Link State Up:",
+    "Link Speed:",
+    "IP:",
+    "Gateway:",
+    "DNS OK:",
+    "IP Source:",
+    "RTT:",
+)
+LINE_SPACING = 4
+
+# SSD1306 addressing commands, used to open a window for partial updates
+SSD1306_COLUMNADDR = 0x21
+SSD1306_PAGEADDR = 0x22
+
+
 class OledDisplay:
     def __init__(self):
         try:
@@ -7,9 +29,24 @@ class OledDisplay:
 
             serial = i2c(port=1, address=0x3C)
             self.device = ssd1306(serial)
-            self.draw = ImageDraw.Draw
-            self.Image = Image
             self.font = ImageFont.load_default()
+            # one frame buffer reused for every message
+            self._image = Image.new("1", self.device.size)
+            self._draw = ImageDraw.Draw(self._image)
+            self._frame_cache = {}
+            self._transpose = Image.Transpose
+            # last frame sent, packed in controller RAM layout
+            self._last_buf = None
+            # same line pitch as a multiline draw.text call
+            self._line_height = (
+                self._draw.textbbox((0, 0), "A", font=self.font)[3] + LINE_SPACING
+            )
+            self._label_tiles = {}
+            for label in STATUS_LABELS:
+                width = math.ceil(self._draw.textlength(label + " ", font=self.font))
+                tile = Image.new("1", (width, self._line_height))
+                ImageDraw.Draw(tile).text((0, 0), label, fill=255, font=self.font)
+                self._label_tiles[label] = tile
             self.enabled = True
         except Exception:
             # OLED not connected or libraries missing
@@ -17,12 +54,90 @@ class OledDisplay:
             self.enabled = False
             print("[OLED] Disabled (no hardware)")
 
-    def show_message(self, text: str):
+    def show_message(self, text: str, cache: bool = False):
         if not self.enabled:
             print("[OLED]", text)
             return
 
-        image = self.Image.new("1", (self.device.width, self.device.height))
-        draw = self.draw(image)
-        draw.text((0, 0), text, fill=255, font=self.font)
-        self.device.display(image)
+        if not cache:
+            self._render(text)
+            self._push(self._image)
+            return
+
+        # fixed messages are rendered once and kept as ready frames
+        frame = self._frame_cache.get(text)
+        if frame is None:
+            self._render(text)
+            frame = self._frame_cache[text] = self._image.copy()
+        self._push(frame)
+
+    def _render(self, text: str):
+        self._draw.rectangle(self.device.bounding_box, fill=0)
+
+        for row, line in enumerate(text.split("\n")):
+            y = row * self._line_height
+            label, sep, value = line.partition(": ")
+            tile = self._label_tiles.get(label + ":") if sep else None
+
+            if tile is None:
+                self._draw.text((0, y), line, fill=255, font=self.font)
+            else:
+                self._image.paste(tile, (0, y))
+                self._draw.text((tile.width, y), value, fill=255, font=self.font)
+
+    def _pack(self, frame) -> tuple[bytearray, int]:
+        # controller RAM is one byte per column per 8-row page, top row in bit 0
+        native = self.device.preprocess(frame)
+        width, pages = native.width, native.height // 8
+        columns = (
+            native.transpose(self._transpose.TRANSPOSE)
+            .transpose(self._transpose.FLIP_LEFT_RIGHT)
+            .tobytes()
+        )
+        buf = bytearray(width * pages)
+        for page in range(pages):
+            buf[page * width : (page + 1) * width] = columns[pages - 1 - page :: pages]
+        return buf, width
+
+    def _push(self, frame):
+        buf, width = self._pack(frame)
+        last, self._last_buf = self._last_buf, buf
+
+        if last is None:
+            self.device.display(frame)
+            return
+
+        # send only the rectangle of pages x columns that changed
+        dirty_pages = [
+            page
+            for page in range(len(buf) // width)
+            if buf[page * width : (page + 1) * width]
+            != last[page * width : (page + 1) * width]
+        ]
+        if not dirty_pages:
+            return
+
+        first_page, last_page = dirty_pages[0], dirty_pages[-1]
+        dirty_cols = [
+            col
+            for col in range(width)
+            if any(
+                buf[page * width + col] != last[page * width + col]
+                for page in range(first_page, last_page + 1)
+            )
+        ]
+        first_col, last_col = dirty_cols[0], dirty_cols[-1]
+
+        colstart = getattr(self.device, "_colstart", 0)
+        self.device.command(
+            SSD1306_COLUMNADDR,
+            colstart + first_col,
+            colstart + last_col,
+            SSD1306_PAGEADDR,
+            first_page,
+            last_page,
+        )
+        window = bytearray()
+        for page in range(first_page, last_page + 1):
+            window += buf[page * width + first_col : page * width + last_col + 1]
+        self.device.data(list(window))
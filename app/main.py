@@ -1,10 +1,24 @@
-from app.core.log import logger
+import argparse
+
+from app.core.log import logger, start_log_listener, stop_log_listener
 from app.state_machine import run_state_machine
 
 
 def main():
-    logger.info("=== Trunex VoIP Tester Booting ===")
-    run_state_machine()
+    parser = argparse.ArgumentParser(prog="voiptester")
+    parser.add_argument(
+        "--tune-net",
+        action="store_true",
+        help="apply BBR, fq and larger TCP buffers before testing",
+    )
+    args = parser.parse_args()
+
+    start_log_listener()
+    try:
+        logger.info("=== Trunex VoIP Tester Booting ===")
+        run_state_machine(tune_net=args.tune_net)
+    finally:
+        stop_log_listener()
 
 
 if __name__ == "__main__":
@@ -1,16 +1,48 @@
 from app.core.log import logger
+from app.core.sysctl import apply_net_tuning
 from app.io.leds_button import LedButtonIO
 from app.io.oled import OledDisplay
 from app.testsuite.net_link import run_network_test
 
 
-def run_state_machine():
+def _format_rtt(result: dict) -> str:
+    if result["rtt_ms"] is not None:
+        return f"{result['rtt_ms']} ms"
+    # internet_ok is None when the test stopped before the probe ran
+    return "FAIL" if result["internet_ok"] is False else "n/a"
+
+
+def _format_result(result: dict) -> str:
+    return "\n".join(
+        (
+            f"Status: {result['status']}",
+            f"RTT: {_format_rtt(result)}",
+            f"Interface: {result['interface']}",
+            f"Physical Link Up: {result['physical_link_up']}",
+            f"Link State Up: {result['link_state_up']}",
+            f"Link Speed: {result['link_speed']}",
+            f"IP: {result['ip_address']}",
+            f"Gateway: {result['gateway']}",
+            f"DNS OK: {result['dns_ok']}",
+            f"IP Source: {result['ip_source']}",
+        )
+    )
+
+
+def run_state_machine(tune_net: bool = False):
+    if tune_net:
+        logger.info("Applying network tuning")
+        if apply_net_tuning():
+            logger.info("Network tuning applied")
+        else:
+            logger.warning("Network tuning incomplete, continuing with defaults")
+
     display = OledDisplay()
     io = LedButtonIO()
 
     logger.info("State machine started")
 
-    display.show_message("Trunex VoIP Tester\nReady")
+    display.show_message("Trunex VoIP Tester\nReady", cache=True)
     io.led_idle()
 
     while True:
@@ -18,31 +50,25 @@ def run_state_machine():
 
         if event == "single":
             logger.info("Running network test")
-            display.show_message("Running Net Test...")
+            display.show_message("Running Net Test...", cache=True)
             io.led_busy()
 
             result = run_network_test()
 
-            display.show_message(
-                f"Status: {result['status']}"
-                f"\nInterface: {result['interface']}"
-                f"\nPhysical Link Up: {result['physical_link_up']}"
-                f"\nLink State Up: {result["link_state_up"]}"
-                f"\nLink Speed: {result['link_speed']}"
-                f"\nIP: {result['ip_address']}"
-                f"\nGateway:{result['gateway']}"
-                f"\nDNS OK: {result['dns_ok']}"
-                f"\nIP Source: {result['ip_source']}"
-            )
+            status = _format_result(result)
+            if display.enabled:
+                display.show_message(status)
+            else:
+                logger.info(status)
             io.led_success()
 
         elif event == "double":
-            display.show_message("SIP Test\n(Not Implemented)")
+            display.show_message("SIP Test\n(Not Implemented)", cache=True)
             logger.info("SIP test placeholder")
             io.led_error()
 
         elif event == "long":
-            display.show_message("Shutdown\n(Not Implemented)")
+            display.show_message("Shutdown\n(Not Implemented)", cache=True)
             logger.info("Long press action placeholder")
 
         # loop continues waiting for next button event
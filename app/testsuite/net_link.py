@@ -1,6 +1,68 @@
+import asyncio
+import json
+import re
+import socket
 import subprocess
+import time
 from typing import Any, Optional
 
+try:
+    from pyroute2 import IPRoute, NetlinkError
+except ImportError:
+    # pyroute2 missing on this image, fall back to the ip command
+    IPRoute = None
+    NetlinkError = OSError
+
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:
+    # dnspython missing, dns_ok falls back to the libc resolver and its
+    # resolv.conf timeout
+    dns = None
+
+# Flag bits from <linux/if.h> and <linux/if_addr.h>
+IFF_LOWER_UP = 0x10000
+IFA_F_PERMANENT = 0x80
+
+DNS_TEST_HOST = "google.com"
+DNS_TIMEOUT_S = 2.0
+
+# HTTPS is far less often filtered than outbound TCP 53 to public resolvers
+PROBE_ADDRESS = ("8.8.8.8", 443)
+PROBE_TIMEOUT_S = 1.0
+
+# "8.8.8.8 via 192.168.1.1 dev eth0 src 192.168.1.20 uid 0"
+_ROUTE_RE = re.compile(r"(?:^|\s)(via|dev|src)\s+(\S+)")
+_ROUTE_KEYS = {"via": "gateway", "dev": "interface", "src": "ip_address"}
+
+_ipr: Optional["IPRoute"] = None
+_resolver: Optional["dns.resolver.Resolver"] = None
+
+
+def _iproute() -> "IPRoute":
+    """
+    Return the shared IPRoute instance, opening the netlink socket on first use.
+    :return: IPRoute
+    """
+    global _ipr
+    if _ipr is None:
+        if IPRoute is None:
+            raise OSError("pyroute2 not available")
+        _ipr = IPRoute()
+    return _ipr
+
+
+def _read_sysfs(interface: str, attribute: str) -> str:
+    """
+    Read a single attribute from /sys/class/net/<interface>/.
+    :param interface: str
+    :param attribute: str
+    :return: the stripped file contents, raises OSError if unavailable
+    """
+    with open(f"/sys/class/net/{interface}/{attribute}") as f:
+        return f.read().strip()
+
 
 def run_network_test() -> dict[str, Any]:
     """
@@ -22,6 +84,9 @@ def run_network_test() -> dict[str, Any]:
             - **gateway** (str): Default gateway address, if detected.
             - **dns_ok** (bool): Whether DNS resolution succeeded.
             - **ip_source** (str): Whether IP was assigned DHCP or static
+            - **internet_ok** (bool | None): Whether 8.8.8.8 accepted a TCP connection,
+              None if the test stopped before probing. Does not affect status.
+            - **rtt_ms** (float): Round trip time of that connection, in milliseconds.
     """
     default_interface = "eth0"
 
@@ -36,9 +101,13 @@ def run_network_test() -> dict[str, Any]:
         "gateway": None,
         "dns_ok": False,
         "ip_source": "none",
+        "internet_ok": None,
+        "rtt_ms": None,
     }
 
-    route_info = detect_default_route()
+    snapshot = collect_link_snapshot(default_interface)
+
+    route_info = snapshot["route"]
     route_interface = route_info.get("interface")
     route_gateway = route_info.get("gateway")
     route_ip = route_info.get("ip_address")
@@ -50,7 +119,7 @@ def run_network_test() -> dict[str, Any]:
         result["gateway"] = route_gateway
         result["ip_address"] = route_ip
 
-    link_info = detect_interface_state(result["interface"])
+    link_info = snapshot["link"]
     result["physical_link_up"] = link_info.get("physical_link_up", False)
     result["link_state_up"] = link_info.get("link_state_up", False)
 
@@ -64,19 +133,22 @@ def run_network_test() -> dict[str, Any]:
         result["reason"] = "Link down"
         return result
 
-    result["link_speed"] = get_link_speed(result["interface"])
-
-    ip_info = detect_ip_source(result["interface"])
+    ip_info = snapshot["ip"]
     result["ip_source"] = ip_info.get("ip_source", "none")
 
     if ip_info.get("ip_present"):
         result["ip_address"] = ip_info.get("ip_address")
     else:
+        result["link_speed"] = get_link_speed(result["interface"])
         result["status"] = "fail"
         result["reason"] = "no ip address"
         return result
 
-    result["dns_ok"] = dns_ok()
+    result["link_speed"], result["dns_ok"], result["rtt_ms"] = asyncio.run(
+        _run_probes(result["interface"])
+    )
+    result["internet_ok"] = result["rtt_ms"] is not None
+
     if not result["dns_ok"]:
         result["status"] = "fail"
         result["reason"] = "dns failed"
@@ -88,17 +160,92 @@ def run_network_test() -> dict[str, Any]:
     return result
 
 
-def detect_default_route() -> dict[str, Any]:
+async def _run_probes(interface: str) -> list[Any]:
+    """
+    Run the link speed read, DNS lookup and reachability probe concurrently so
+    the test takes as long as the slowest of them rather than their sum.
+    :param interface: str
+    :return: [link_speed, dns_ok, rtt_ms]
+    """
+    return await asyncio.gather(
+        asyncio.to_thread(get_link_speed, interface),
+        asyncio.to_thread(dns_ok),
+        asyncio.to_thread(internet_rtt_ms),
+    )
+
+
+def collect_link_snapshot(interface: str) -> dict[str, Any]:
+    """
+    Fetch everything run_network_test needs from the kernel in one pass over the
+    shared netlink socket: the route to 8.8.8.8, the link it leaves through and
+    that link's IPv4 addresses. If there is no route, <interface> is used instead.
+    Without pyroute2 the route comes from `ip route get` and the link and
+    addresses from a single `ip -j addr show` dump.
+    :param interface: str
+
+    :return: a dict with keys:
+    - "interface": str
+    - "route": dict as returned by parse_route
+    - "link": dict as returned by parse_link
+    - "ip": dict as returned by parse_addr
+    """
+    if IPRoute is None:
+        route_info = _route_from_ip_command()
+        interface = route_info["interface"] or interface
+        iface = collect_all_ip_info().get(interface)
+        return {
+            "interface": interface,
+            "route": route_info,
+            "link": parse_link_json(iface),
+            "ip": parse_addr_json(iface),
+        }
+
+    snapshot: dict[str, Any] = {"interface": interface}
+    route = link = None
+    addrs: list[Any] = []
+
+    try:
+        ipr = _iproute()
+        routes = ipr.route("get", dst="8.8.8.8")
+        if routes:
+            route = routes[0]
+    except (OSError, NetlinkError) as exc:
+        snapshot["error"] = str(exc)
+
+    oif = route.get_attr("RTA_OIF") if route is not None else None
+    try:
+        ipr = _iproute()
+        if oif is not None:
+            link = ipr.get_links(oif)[0]
+        else:
+            link = ipr.link("get", ifname=interface)[0]
+    except (OSError, NetlinkError) as exc:
+        snapshot["error"] = str(exc)
+
+    if link is not None:
+        snapshot["interface"] = link.get_attr("IFLA_IFNAME")
+        try:
+            addrs = ipr.get_addr(family=socket.AF_INET, label=snapshot["interface"])
+        except (OSError, NetlinkError) as exc:
+            snapshot["error"] = str(exc)
+
+    snapshot["route"] = parse_route(route, link)
+    snapshot["link"] = parse_link(link)
+    snapshot["ip"] = parse_addr(addrs)
+
+    return snapshot
+
+
+def parse_route(route: Any, link: Any) -> dict[str, Any]:
     """
-    Ask the kernel how it would route traffic to 8.8.8.8 and extract:
-    - interface (dev)
-    - gateway (via)
-    - ip_address (src)
+    Extract interface, gateway and source address from an RTM_NEWROUTE message.
+    :param route: route message or None
+    :param link: link message for the route's RTA_OIF, or None
 
-    Returns a dict with keys:
-      - "interface": str | None
-      - "gateway": str | None
-      - "ip_address: str | None
+    :return: a dict with keys:
+    - "interface": str | None
+    - "gateway": str | None
+    - "ip_address": str | None
     """
     route_info: dict[str, Any] = {
         "gateway": None,
@@ -106,170 +253,244 @@ def detect_default_route() -> dict[str, Any]:
         "ip_address": None,
     }
 
-    try:
-        route_result = subprocess.run(
-            ["ip", "route", "get", "8.8.8.8"], capture_output=True, text=True
-        ).stdout
-    except OSError as exc:
-        route_info["error"] = str(exc)
-        return route_info
-
-    if not route_result:
-        route_info["error"] = "no route output"
-        return route_info
-    tokens = route_result.strip().split()
-    if not tokens:
-        route_info["error"] = "empty route tokens"
+    if route is None:
         return route_info
 
-    for i, token in enumerate(tokens):
-        if token == "via" and i + 1 < len(tokens):
-            route_info["gateway"] = tokens[i + 1]
-        elif token == "dev" and i + 1 < len(tokens):
-            route_info["interface"] = tokens[i + 1]
-        elif token == "src" and i + 1 < len(tokens):
-            route_info["ip_address"] = tokens[i + 1]
+    if link is not None:
+        route_info["interface"] = link.get_attr("IFLA_IFNAME")
+    route_info["gateway"] = route.get_attr("RTA_GATEWAY")
+    route_info["ip_address"] = route.get_attr("RTA_PREFSRC")
 
     return route_info
 
 
-def detect_interface_state(interface: str) -> dict[str, Any]:
+def parse_route_text(output: str) -> dict[str, Any]:
     """
-    Check interface state using ip link show <interface> and extract:
-    - LOWER UP (if physical interface is connected)
-    - state UP (if interface is UP)
-    :param interface: str
+    Extract interface (dev), gateway (via) and ip_address (src) from the text
+    output of `ip route get`.
+    :param output: str
 
     :return: a dict with keys:
-    - "physical_link_up": bool
-    - "link_state_up": bool
+    - "interface": str | None
+    - "gateway": str | None
+    - "ip_address": str | None
     """
-    interface_info: dict[str, Any] = {"physical_link_up": False, "link_state_up": False}
+    route_info: dict[str, Any] = {
+        "gateway": None,
+        "interface": None,
+        "ip_address": None,
+    }
+
+    for key, value in _ROUTE_RE.findall(output):
+        route_info[_ROUTE_KEYS[key]] = value
 
+    return route_info
+
+
+def _route_from_ip_command() -> dict[str, Any]:
+    """
+    Fallback for the netlink route lookup when pyroute2 is not installed.
+    :return: a dict like parse_route
+    """
     try:
-        result = subprocess.run(
-            ["ip", "link", "show", interface], capture_output=True, text=True
+        output = subprocess.run(
+            ["ip", "route", "get", "8.8.8.8"], capture_output=True, text=True
         ).stdout
     except OSError as exc:
-        interface_info["error"] = str(exc)
-        return interface_info
+        return parse_route_text("") | {"error": str(exc)}
 
-    if not result:
-        interface_info["error"] = "link state not available"
-        return interface_info
+    if not output.strip():
+        return parse_route_text("") | {"error": "no route output"}
 
-    if "LOWER_UP" in result:
-        interface_info["physical_link_up"] = True
+    return parse_route_text(output)
 
-    if "state UP" in result:
-        interface_info["link_state_up"] = True
 
-    return interface_info
+def parse_link(link: Any) -> dict[str, Any]:
+    """
+    Extract carrier and operational state from an RTM_NEWLINK message.
+    :param link: link message or None
 
+    :return: a dict with keys:
+    - "physical_link_up": bool
+    - "link_state_up": bool
+    """
+    if link is None:
+        return {"physical_link_up": False, "link_state_up": False}
 
-def get_link_speed(interface: str) -> Optional[str]:
+    return {
+        "physical_link_up": bool(link["flags"] & IFF_LOWER_UP),
+        "link_state_up": link.get_attr("IFLA_OPERSTATE") == "UP",
+    }
+
+
+def parse_addr(addrs: list[Any]) -> dict[str, Any]:
     """
-    Check interface speed using ethtool <interface> abd extract:
-    - link speed
-    :param interface: str
-    :return: a str representing link speed or None if unknown/unavailable
+    Pick the first IPv4 address from RTM_NEWADDR messages and classify it.
+    An address without IFA_F_PERMANENT has a lease lifetime, i.e. came from DHCP.
+    :param addrs: list of address messages
+
+    :return: a dict with keys:
+    - "ip_present": bool
+    - "ip_address": str | None
+    - "ip_source": "dhcp" | "static" | "none"
     """
-    try:
-        result = subprocess.run(
-            ["ethtool", interface], capture_output=True, text=True
-        ).stdout
-    except OSError:
-        return None
+    info: dict[str, Any] = {
+        "ip_present": False,
+        "ip_address": None,
+        "ip_source": "none",
+    }
+
+    for addr in addrs:
+        address = addr.get_attr("IFA_ADDRESS")
+        if not address:
+            continue
 
-    lines = result.splitlines()
-    for line in lines:
-        stripped = line.lstrip()
-        if stripped.startswith("Speed:"):
-            parts = stripped.split(":", 1)
-            if len(parts) != 2:
-                return None
+        info["ip_address"] = address
+        info["ip_present"] = True
 
-            value = parts[1].strip()
-            if not value:
-                return None
+        flags = addr.get_attr("IFA_FLAGS")
+        if flags is None:
+            flags = addr["flags"]
 
-            if "unknown" in value.lower():
-                return None
+        if flags & IFA_F_PERMANENT:
+            info["ip_source"] = "static"
+        else:
+            info["ip_source"] = "dhcp"
 
-            return value
+        return info
 
-    return None
+    return info
 
 
-def dns_ok() -> bool:
+def collect_all_ip_info() -> dict[str, dict[str, Any]]:
     """
-    Check if DNS is working by doing query on google.com
-    :return: bool
+    Fallback for the netlink dumps when pyroute2 is not installed: read every
+    interface's flags, operstate and addresses with one `ip -j addr show`.
+    :return: the parsed JSON keyed by interface name, empty on failure
     """
     try:
-        result = subprocess.run(
-            ["dig", "+short", "google.com"], capture_output=True, text=True
-        ).stdout.strip()
-    except OSError:
-        return False
+        output = subprocess.run(
+            ["ip", "-j", "addr", "show"], capture_output=True, text=True
+        ).stdout
+        data = json.loads(output)
+    except (OSError, ValueError):
+        return {}
 
-    return bool(result)
+    return {iface["ifname"]: iface for iface in data}
 
 
-def detect_ip_source(interface: str) -> dict[str, Any]:
+def parse_link_json(iface: Optional[dict[str, Any]]) -> dict[str, Any]:
     """
-    Detect whether an interface's IPv4 address came from DHCP, static config, or if no IP is present.
+    Extract carrier and operational state from one `ip -j addr show` entry.
+    :param iface: dict or None
 
-    Uses: `ip -4 addr show dev <interface>`
-    Logic:
-      - If no 'inet ' line  → no IPv4 assigned (ip_source = "none")
-      - If inet line contains 'dynamic' → DHCP
-      - Else → static
+    :return: a dict with keys:
+    - "physical_link_up": bool
+    - "link_state_up": bool
+    """
+    if iface is None:
+        return {"physical_link_up": False, "link_state_up": False}
 
-    Returns a dict:
-        {
-            "ip_present": bool,
-            "ip_address": str | None,
-            "ip_source": "dhcp" | "static" | "none",
-        }
+    return {
+        "physical_link_up": "LOWER_UP" in iface.get("flags", ()),
+        "link_state_up": iface.get("operstate") == "UP",
+    }
+
+
+def parse_addr_json(iface: Optional[dict[str, Any]]) -> dict[str, Any]:
     """
+    Pick the first IPv4 address from one `ip -j addr show` entry and classify it.
+    ip marks addresses with a lease lifetime as "dynamic", i.e. from DHCP.
+    :param iface: dict or None
 
+    :return: a dict like parse_addr
+    """
     info: dict[str, Any] = {
         "ip_present": False,
         "ip_address": None,
         "ip_source": "none",
     }
 
-    try:
-        result = subprocess.run(
-            ["ip", "-4", "addr", "show", "dev", interface],
-            capture_output=True,
-            text=True,
-        ).stdout
-    except OSError as exc:
-        info["error"] = str(exc)
+    if iface is None:
         return info
 
-    if not result:
+    for addr in iface.get("addr_info", ()):
+        if addr.get("family") != "inet" or not addr.get("local"):
+            continue
+
+        info["ip_address"] = addr["local"]
+        info["ip_present"] = True
+        info["ip_source"] = "dhcp" if addr.get("dynamic") else "static"
         return info
 
-    for line in result.splitlines():
-        line = line.strip()
+    return info
 
-        if line.startswith("inet"):
-            parts = line.split()
-            if len(parts) < 2:
-                continue
 
-            addr = parts[1].split("/")[0]
-            info["ip_address"] = addr
-            info["ip_present"] = True
+def get_link_speed(interface: str) -> Optional[str]:
+    """
+    Check interface speed using /sys/class/net/<interface>/speed and extract:
+    - link speed
+    :param interface: str
+    :return: a str representing link speed (e.g. "1G", "100M", "10M")
+        or None if unknown/unavailable
+    """
+    try:
+        mbps = int(_read_sysfs(interface, "speed"))
+    except (OSError, ValueError):
+        return None
+
+    # the kernel reports -1 (SPEED_UNKNOWN) when there is no link
+    if mbps <= 0:
+        return None
 
-            if "dynamic" in line:
-                info["ip_source"] = "dhcp"
-            else:
-                info["ip_source"] = "static"
+    if mbps >= 1000 and mbps % 1000 == 0:
+        return f"{mbps // 1000}G"
 
-            return info
+    return f"{mbps}M"
 
-    return info
+
+def dns_ok() -> bool:
+    """
+    Check if DNS is working by doing query on google.com
+
+    Queries the configured nameservers directly with dnspython when it is
+    installed, so nscd/systemd-resolved caches cannot hide a broken upstream
+    and the lookup is bounded by DNS_TIMEOUT_S. Otherwise falls back to
+    getaddrinfo, whose timeout comes from resolv.conf.
+    :return: bool
+    """
+    global _resolver
+    if dns is not None:
+        try:
+            # reading resolv.conf raises NoResolverConfiguration if it is empty
+            if _resolver is None:
+                _resolver = dns.resolver.Resolver()
+                _resolver.lifetime = DNS_TIMEOUT_S
+            return bool(_resolver.resolve(DNS_TEST_HOST, "A"))
+        except (dns.exception.DNSException, OSError):
+            # rebuild next time in case resolv.conf changed (e.g. new DHCP lease)
+            _resolver = None
+            return False
+
+    try:
+        return bool(socket.getaddrinfo(DNS_TEST_HOST, None, socket.AF_INET))
+    except OSError:
+        return False
+
+
+def internet_rtt_ms() -> Optional[float]:
+    """
+    Check internet reachability with a TCP connect to 8.8.8.8:443.
+    Unlike ICMP this needs no raw socket privileges or ping binary.
+    :return: connect round trip time in ms, or None if unreachable
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(PROBE_TIMEOUT_S)
+    try:
+        start = time.perf_counter()
+        sock.connect(PROBE_ADDRESS)
+        return round((time.perf_counter() - start) * 1000, 1)
+    except OSError:
+        return None
+    finally:
+        sock.close()